@@ -1,48 +1,81 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-from datetime import timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ichimoku_kernel import Ichimoku_cloud_func, conversion_base_crossover
 # import plotly.express as px
 
-
-def Ichimoku_cloud_func(df):
-    high_9 = df['High'].rolling(window= 9).max()
-    low_9 = df['Low'].rolling(window= 9).min()
-    df['tenkan_sen'] = (high_9 + low_9) /2
-
-    high_26 = df['High'].rolling(window= 26).max()
-    low_26 = df['Low'].rolling(window= 26).min()
-    df['kijun_sen'] = (high_26 + low_26) /2
-
-    df['chikou_span'] = df['Close'].shift(-26)
-
-    for i in range(26):
-        line = pd.to_datetime(df.index[-1] + timedelta(minutes=60))
-        new_row = pd.DataFrame(index=[line])
-        df = pd.concat([df, pd.DataFrame(new_row)], ignore_index=False)
-
-    # Senkou Span A (Leading Span A): (Conversion Line + Base Line)/2))
-    df['senkou_span_a'] = ((df['tenkan_sen'] + df['kijun_sen']) / 2).shift(26)
-
-    # Senkou Span B (Leading Span B): (52-period high + 52-period low)/2))
-    period52_high = df['High'].rolling(window=52).max()
-    period52_low = df['Low'].rolling(window=52).min()
-    df['senkou_span_b'] = ((period52_high + period52_low) / 2).shift(26)
-
-    return df
-
-def conversion_base_crossover(df):
-    df.loc[:, ('crossover1')] = (df.kijun_sen < df.tenkan_sen) & (df.kijun_sen.shift(1) > df.tenkan_sen.shift(1))
-    df['conversion_base_crossover'] = np.where(df['tenkan_sen'] > df['kijun_sen'], 1, 0)
-    return df
+# Ichimoku line traces and their colours, in legend order
+ICHIMOKU_LINES = (
+    ('tenkan_sen', 'blue'),
+    ('kijun_sen', 'orange'),
+    ('chikou_span', 'white'),
+    ('senkou_span_a', 'red'),
+    ('senkou_span_b', 'green'),
+)
+WEEKEND_RANGEBREAKS = (dict(bounds=["sat", "mon"]),)
+# (connect, read) seconds for the price history request. With one connect
+# retry, a stalled fetch holds the script thread for about 2*5 + 10 s at most,
+# the same bound as yfinance's default timeout=10 without retries
+HISTORY_TIMEOUT = (5, 10)
+
+
+@st.cache_resource
+def _session():
+    # One pooled keep-alive session shared by every yfinance call in the process.
+    # A failed connect is retried once, immediately; reads are never retried,
+    # since a retried read would repeat the full read timeout
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                                          max_retries=Retry(total=1, read=0)))
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _history(sym, period):
+    # Corporate actions are never charted, so skip fetching and merging them
+    df = yf.Ticker(sym, session=_session()).history(period=period, actions=False, timeout=HISTORY_TIMEOUT)
+    # yfinance reports failures as an empty frame; raise so the miss isn't cached
+    if df.empty:
+        raise ValueError(f'No price history returned for {sym}')
+    df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+    # Prices fit comfortably in float32, halving the bytes every rolling pass touches
+    return df.astype({'Open': 'float32', 'High': 'float32', 'Low': 'float32', 'Close': 'float32'})
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _ichimoku(df):
+    # Keyed on the frame's content hash, so identical history skips recomputation
+    return conversion_base_crossover(Ichimoku_cloud_func(df))
+
+def _figure(df):
+    fig = go.Figure()
+
+    fig.add_trace(go.Candlestick(x=df.index,
+                    open=df['Open'],
+                    high=df['High'],
+                    low=df['Low'],
+                    close=df['Close']))
+
+    fig.update_xaxes(rangebreaks=WEEKEND_RANGEBREAKS)
+
+    for col, color in ICHIMOKU_LINES:
+        fig.add_trace(go.Scatter(x=df.index, y=df[col], mode="lines", name=col, line=go.scatter.Line(color=color)))
+
+    fig.add_trace(go.Scatter(x=df.index, y=df['crossover1'],mode='markers'))
+    return fig
+
+@st.cache_data(ttl=86400)
+def _load_tickers():
+    # Only the Symbol column feeds the sidebar, so skip parsing the rest
+    return tuple(pd.read_csv('SP500 Index.csv', usecols=[0], dtype='string').iloc[:, 0].tolist())
 
 st.set_page_config(page_title='Ichimoku Cloud Homepage')
 st.header('Please select a ticker')
 
 st.sidebar.subheader('Ichimoku Cloud plot checker')
-ticker_list = pd.read_csv('SP500 Index.csv')
+ticker_list = _load_tickers()
 # tickerSymbol = st.sidebar.selectbox('Stock ticker', ticker_list)
 ticker_options = st.sidebar.multiselect(
     'What are your favorite colors',
@@ -50,35 +83,25 @@ ticker_options = st.sidebar.multiselect(
     ['MSFT']
 )
 
+# Options come from the bundled symbol list, so an empty selection is the only
+# bad input; stop before it reaches yfinance
+if not ticker_options:
+    st.info('Select a ticker in the sidebar to plot its Ichimoku Cloud.')
+    st.stop()
+
 tickerSymbol = ticker_options[0]
 
-tickerData = yf.Ticker(tickerSymbol) 
-tickerDf = tickerData.history(period='1y')
-tickerDf = Ichimoku_cloud_func(tickerDf)
-tickerDf = conversion_base_crossover(tickerDf)
+try:
+    historyDf = _history(tickerSymbol, '1y')
+except ValueError as e:
+    st.error(e)
+    st.stop()
+
+tickerDf = _ichimoku(historyDf)
 
 #st.write(ticker_options[0])
 #st.write(type(ticker_options))
 st.header('**Ticker data**')
 st.write(tickerDf)
 
-fig = go.Figure()
-
-fig.add_trace(go.Candlestick(x=tickerDf.index,
-                open=tickerDf['Open'],
-                high=tickerDf['High'],
-                low=tickerDf['Low'],
-                close=tickerDf['Close']))
-
-fig.update_xaxes(rangebreaks=[dict(bounds=["sat", "mon"])])
-
-fig.add_trace(go.Scatter(x=tickerDf.index, y=tickerDf['tenkan_sen'], mode="lines", name='tenkan_sen',line=go.scatter.Line(color="blue")))
-fig.add_trace(go.Scatter(x=tickerDf.index, y=tickerDf['kijun_sen'], mode="lines", name='kijun_sen', line=go.scatter.Line(color="orange")))
-fig.add_trace(go.Scatter(x=tickerDf.index, y=tickerDf['chikou_span'], mode="lines", name='chikou_span',line=go.scatter.Line(color="white")))
-fig.add_trace(go.Scatter(x=tickerDf.index, y=tickerDf['senkou_span_a'], mode="lines", name='senkou_span_a',line=go.scatter.Line(color="red")))
-fig.add_trace(go.Scatter(x=tickerDf.index, y=tickerDf['senkou_span_b'], mode="lines", name='senkou_span_b',line=go.scatter.Line(color="green")))
-
-fig.add_trace(go.Scatter(x=tickerDf.index, y=tickerDf['crossover1'],mode='markers'))
-
-
-st.plotly_chart(fig)
+st.plotly_chart(_figure(tickerDf))
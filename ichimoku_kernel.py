@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit, types
+except ImportError:
+    njit = None
+
+# Tenkan-sen, Kijun-sen and Senkou Span B lookback windows. Numba freezes
+# module globals at compile time, so the kernel sees these as constants.
+TENKAN_WINDOW = 9
+KIJUN_WINDOW = 26
+SENKOU_B_WINDOW = 52
+WINDOWS = (TENKAN_WINDOW, KIJUN_WINDOW, SENKOU_B_WINDOW)
+
+
+def _rolling_midpoints(high, low, out):
+    # One pass over high/low keeping a monotonic deque of indices per window,
+    # so each rolling max/min is read off the deque head in O(1)
+    n = high.shape[0]
+    m = len(WINDOWS)
+    max_q = np.empty((m, n), dtype=np.int64)
+    min_q = np.empty((m, n), dtype=np.int64)
+    max_head = np.zeros(m, dtype=np.int64)
+    max_tail = np.zeros(m, dtype=np.int64)
+    min_head = np.zeros(m, dtype=np.int64)
+    min_tail = np.zeros(m, dtype=np.int64)
+
+    for i in range(n):
+        for k in range(m):
+            window = WINDOWS[k]
+
+            tail = max_tail[k]
+            while tail > max_head[k] and high[max_q[k, tail - 1]] <= high[i]:
+                tail -= 1
+            max_q[k, tail] = i
+            max_tail[k] = tail + 1
+            if max_q[k, max_head[k]] <= i - window:
+                max_head[k] += 1
+
+            tail = min_tail[k]
+            while tail > min_head[k] and low[min_q[k, tail - 1]] >= low[i]:
+                tail -= 1
+            min_q[k, tail] = i
+            min_tail[k] = tail + 1
+            if min_q[k, min_head[k]] <= i - window:
+                min_head[k] += 1
+
+            if i >= window - 1:
+                out[k, i] = (high[max_q[k, max_head[k]]] + low[min_q[k, min_head[k]]]) / 2
+            else:
+                out[k, i] = np.nan
+
+
+if njit is not None:
+    # Eager float32/float64 signatures compile (or load from the on-disk
+    # cache) at import, so the first chart render never waits on the JIT.
+    # Inputs are typed read-only since pandas may hand out read-only views.
+    _rolling_midpoints = njit(
+        [
+            types.void(
+                types.Array(dtype, 1, 'C', readonly=True),
+                types.Array(dtype, 1, 'C', readonly=True),
+                types.Array(dtype, 2, 'C'),
+            )
+            for dtype in (types.float32, types.float64)
+        ],
+        cache=True,
+    )(_rolling_midpoints)
+
+
+def rolling_midpoints(high, low):
+    # Keep the caller's float width so float32 prices stay float32 end to end;
+    # integer prices promote to float so midpoints aren't truncated
+    dtype = np.result_type(high, low, np.float32)
+    high = np.ascontiguousarray(high, dtype=dtype)
+    low = np.ascontiguousarray(low, dtype=dtype)
+    out = np.empty((len(WINDOWS), len(high)), dtype=dtype)
+
+    # The deque kernel assumes gap-free prices; NaNs take the strided path,
+    # where np.max/np.min propagate them exactly like pandas rolling would
+    if njit is not None and not (np.isnan(high).any() or np.isnan(low).any()):
+        _rolling_midpoints(high, low, out)
+    else:
+        for k, window in enumerate(WINDOWS):
+            out[k, :window - 1] = np.nan
+            if len(high) >= window:
+                window_high = sliding_window_view(high, window).max(axis=1)
+                window_low = sliding_window_view(low, window).min(axis=1)
+                out[k, window - 1:] = (window_high + window_low) / 2
+    return out
+
+
+def Ichimoku_cloud_func(df):
+    # Tenkan-sen (9), Kijun-sen (26) and the 52-period midpoint in one pass
+    tenkan, kijun, period52_mid = rolling_midpoints(df['High'].to_numpy(), df['Low'].to_numpy())
+    df['tenkan_sen'] = tenkan
+    df['kijun_sen'] = kijun
+
+    # Chikou, Senkou A and Senkou B are written in place into one NaN-filled
+    # buffer already sized for the 26 forecast rows
+    n = len(df)
+    shifted = np.full((3, n + 26), np.nan, dtype=tenkan.dtype)
+    shifted[0, :max(n - 26, 0)] = df['Close'].to_numpy()[26:]
+    df['chikou_span'] = shifted[0, :n]
+
+    # Extend the index 26 periods into the future in a single reindex
+    freq = df.index.freq
+    if freq is None:
+        # A single row (e.g. a fresh listing) has no step to infer; assume daily bars
+        step = df.index[-1] - df.index[-2] if len(df) > 1 else timedelta(days=1)
+        freq = pd.offsets.BDay() if step >= timedelta(days=1) else step
+    future_index = pd.date_range(df.index[-1] + freq, periods=26, freq=freq)
+    df = df.reindex(df.index.append(future_index))
+
+    # Senkou Span A (Leading Span A): (Conversion Line + Base Line)/2))
+    np.add(tenkan, kijun, out=shifted[1, 26:])
+    shifted[1, 26:] /= 2
+    df['senkou_span_a'] = shifted[1]
+
+    # Senkou Span B (Leading Span B): (52-period high + 52-period low)/2))
+    shifted[2, 26:] = period52_mid
+    df['senkou_span_b'] = shifted[2]
+
+    return df
+
+def conversion_base_crossover(df):
+    tenkan = df['tenkan_sen'].to_numpy()
+    kijun = df['kijun_sen'].to_numpy()
+    crossover = np.zeros(len(df), dtype=bool)
+    crossover[1:] = (kijun[1:] < tenkan[1:]) & (kijun[:-1] > tenkan[:-1])
+    df['crossover1'] = crossover
+    df['conversion_base_crossover'] = (tenkan > kijun).astype(np.int8)
+    return df
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import timedelta
+
+import ichimoku_kernel
+from ichimoku_kernel import WINDOWS, Ichimoku_cloud_func, conversion_base_crossover, rolling_midpoints
+
+
+LENGTHS = [1, 8, 9, 10, 25, 26, 27, 51, 52, 53, 200]
+
+
+def _prices(n, dtype, ties=False):
+    rng = np.random.default_rng(n)
+    if ties:
+        # Few distinct levels, so windows hold repeated maxima and minima
+        high = rng.integers(5, 8, n).astype(dtype)
+        low = high - rng.integers(0, 3, n).astype(dtype)
+    else:
+        high = (100 + rng.standard_normal(n).cumsum()).astype(dtype)
+        low = high - rng.random(n).astype(dtype)
+    return high, low
+
+
+def _rolling_reference(high, low):
+    high, low = pd.Series(high, dtype='float64'), pd.Series(low, dtype='float64')
+    return np.array([((high.rolling(w).max() + low.rolling(w).min()) / 2).to_numpy() for w in WINDOWS])
+
+
+@pytest.mark.parametrize('n', LENGTHS)
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+@pytest.mark.parametrize('ties', [False, True])
+@pytest.mark.parametrize('numba_path', [True, False])
+def test_rolling_midpoints_match_pandas(monkeypatch, n, dtype, ties, numba_path):
+    if numba_path and ichimoku_kernel.njit is None:
+        pytest.skip('numba is not installed')
+    if not numba_path:
+        monkeypatch.setattr(ichimoku_kernel, 'njit', None)
+    high, low = _prices(n, dtype, ties)
+    # pandas hands out read-only views, so the kernel has to accept them
+    high.setflags(write=False)
+    low.setflags(write=False)
+
+    out = rolling_midpoints(high, low)
+
+    assert out.shape == (len(WINDOWS), n)
+    assert out.dtype == dtype
+    np.testing.assert_allclose(out, _rolling_reference(high, low),
+                               rtol=1e-6 if dtype == np.float32 else 0, equal_nan=True)
+
+
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_rolling_midpoints_propagate_nan_like_pandas(dtype):
+    high, low = _prices(120, dtype)
+    high[30] = np.nan
+    low[70] = np.nan
+
+    out = rolling_midpoints(high, low)
+
+    assert out.dtype == dtype
+    np.testing.assert_allclose(out, _rolling_reference(high, low),
+                               rtol=1e-6 if dtype == np.float32 else 0, equal_nan=True)
+
+
+@pytest.mark.parametrize('numba_path', [True, False])
+def test_rolling_midpoints_promote_integer_prices(monkeypatch, numba_path):
+    if not numba_path:
+        monkeypatch.setattr(ichimoku_kernel, 'njit', None)
+    high, low = _prices(60, np.float64, ties=True)
+    high, low = high.astype(np.int64), (low - 1).astype(np.int64)
+
+    out = rolling_midpoints(high, low)
+
+    assert out.dtype == np.float64
+    np.testing.assert_array_equal(out, _rolling_reference(high, low))
+
+
+def _history(n, dtype='float64'):
+    # Daily bars on business days with no stored freq, like yfinance returns
+    index = pd.DatetimeIndex(pd.bdate_range('2024-01-02', periods=n, tz='America/New_York').to_list())
+    rng = np.random.default_rng(n)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame({
+        'Open': close + rng.standard_normal(n),
+        'High': close + 2,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': rng.integers(1_000, 10_000, n),
+    }, index=index).astype({'Open': dtype, 'High': dtype, 'Low': dtype, 'Close': dtype})
+
+
+def _shift_based_ichimoku(df):
+    # The concat/shift and np.where formulation the array version replaced
+    df = df.copy()
+    df['tenkan_sen'] = (df['High'].rolling(9).max() + df['Low'].rolling(9).min()) / 2
+    df['kijun_sen'] = (df['High'].rolling(26).max() + df['Low'].rolling(26).min()) / 2
+    df['chikou_span'] = df['Close'].shift(-26)
+    for i in range(26):
+        df = pd.concat([df, pd.DataFrame(index=[df.index[-1] + timedelta(minutes=60)])])
+    df['senkou_span_a'] = ((df['tenkan_sen'] + df['kijun_sen']) / 2).shift(26)
+    df['senkou_span_b'] = ((df['High'].rolling(52).max() + df['Low'].rolling(52).min()) / 2).shift(26)
+    df.loc[:, ('crossover1')] = (df.kijun_sen < df.tenkan_sen) & (df.kijun_sen.shift(1) > df.tenkan_sen.shift(1))
+    df['conversion_base_crossover'] = np.where(df['tenkan_sen'] > df['kijun_sen'], 1, 0)
+    return df
+
+
+@pytest.mark.parametrize('n', [1, 2, 27, 60, 251])
+def test_forecast_rows_are_26_business_days(n):
+    df = _history(n)
+    result = Ichimoku_cloud_func(df.copy())
+
+    assert len(result) == n + 26
+    assert result.index[:n].equals(df.index)
+    future = result.index[n:]
+    assert future.equals(pd.date_range(df.index[-1], periods=27, freq=pd.offsets.BDay())[1:])
+    assert result.iloc[n:][['Open', 'High', 'Low', 'Close', 'Volume']].isna().all().all()
+
+
+@pytest.mark.parametrize('n', [1, 2, 27, 60, 251])
+@pytest.mark.parametrize('dtype', ['float32', 'float64'])
+def test_matches_shift_based_columns(n, dtype):
+    df = _history(n, dtype)
+    result = conversion_base_crossover(Ichimoku_cloud_func(df.copy()))
+    expected = _shift_based_ichimoku(df)
+
+    rtol = 1e-6 if dtype == 'float32' else 1e-12
+    for col in ['tenkan_sen', 'kijun_sen', 'chikou_span', 'senkou_span_a', 'senkou_span_b']:
+        np.testing.assert_allclose(result[col].to_numpy(dtype='float64'),
+                                   expected[col].to_numpy(dtype='float64'),
+                                   rtol=rtol, equal_nan=True, err_msg=col)
+    for col in ['crossover1', 'conversion_base_crossover']:
+        np.testing.assert_array_equal(result[col].to_numpy(dtype='int64'),
+                                      expected[col].to_numpy(dtype='int64'), err_msg=col)
+
+
+def test_keeps_existing_index_freq():
+    df = _history(40)
+    df.index.freq = 'B'
+    result = Ichimoku_cloud_func(df.copy())
+    assert result.index[40:].equals(pd.date_range(df.index[-1], periods=27, freq='B')[1:])